@@ -80,6 +80,17 @@ win_pics = r"""
 """
 
 
+def get_separator(char: str = "—", length: int = 81) -> str:
+    """
+    Возвращает разделительную линию из указанного символа, повторенного указанное количество раз.
+
+    :param char: Символ для разделителя, по умолчанию "—".
+    :param length: Длина разделителя, по умолчанию 81.
+    :return: Строка разделителя без перевода строки.
+    """
+    return char * length
+
+
 def print_separator(char: str = "—", length: int = 81) -> None:
     """
     Выводит разделительную линию из указанного символа, повторенного указанное количество раз.
@@ -87,4 +98,4 @@ def print_separator(char: str = "—", length: int = 81) -> None:
     :param char: Символ для разделителя, по умолчанию "—".
     :param length: Длина разделителя, по умолчанию 81.
     """
-    print(char * length)
+    print(get_separator(char, length))
@@ -1,21 +1,44 @@
+import os
 import sys
 from collections import Counter
-from random import choice, sample
-from typing import TypedDict
+from dataclasses import dataclass, field
+from random import choice, randrange
 
-from display import draw_hangman, print_separator, win_pics
+from display import draw_hangman, get_separator, print_separator, win_pics
 
 EASY_MODE_LETTERS: int = 2
-WORDS: list[str] = []
-
-
-class GameState(TypedDict):
+WORDS_FILE: str = "words.txt"
+# Файл слов больше этого размера не загружается в память: слово выбирается построчным чтением файла
+STREAM_THRESHOLD_BYTES: int = 4 * 1024 * 1024
+WORDS: tuple[str, ...] = ()
+STREAM_WORDS: bool = False
+RUSSIAN_LETTERS: frozenset[str] = frozenset(chr(code) for code in range(ord("А"), ord("Я") + 1)) | {"Ё"}
+# Таблица для str.translate: строчные буквы русского алфавита в заглавные, остальные символы не меняются
+RUSSIAN_UPPERCASE_TABLE: dict[int, int] = {ord(letter.lower()): ord(letter) for letter in RUSSIAN_LETTERS}
+# Буквы русского алфавита от самых частых к самым редким: чем меньше ранг, тем больше подсказка о слове
+RUSSIAN_LETTER_FREQUENCY_RANK: dict[str, int] = {
+    letter: rank for rank, letter in enumerate("ОЕАИНТСРВЛКМДПУЯЫЬГЗБЧЙХЖШЮЦЩЭФЪЁ")
+}
+MENU_ACTIONS: dict[int, tuple[str, str]] = {
+    1: ("Да, в легком режиме (изначально известны 2 буквы)", "easy"),
+    2: ("Да, в нормальном режиме (все буквы неизвестны)", "normal"),
+    3: ("Нет", "exit"),
+}
+MENU_TEXT: str = "\n".join(f"[{num}] {desc}" for num, (desc, _) in MENU_ACTIONS.items())
+VALID_CHOICES_TEXT: str = ", ".join(map(str, MENU_ACTIONS))
+
+
+@dataclass(slots=True)
+class GameState:
     word: str
-    mask: list[str]
-    error_count: int
-    guessed_letters: list[str]
-    max_errors: int
-    game_mode: str
+    flags: bytearray
+    game_mode: str = "normal"
+    error_count: int = 0
+    guessed: str = ""
+    max_errors: int = 6
+    letter_set: frozenset[str] = frozenset()
+    revealed: set[str] = field(default_factory=set)
+    remaining: int = 0
 
 
 def main() -> None:
@@ -61,26 +84,18 @@ def show_menu() -> str:
 
     :return: Режим игры ('easy', 'normal' или 'exit'), выбранный пользователем.
     """
-    actions = {
-        1: ("Да, в легком режиме (изначально известны 2 буквы)", "easy"),
-        2: ("Да, в нормальном режиме (все буквы неизвестны)", "normal"),
-        3: ("Нет", "exit"),
-    }
-    menu_text = "\n".join(f"[{num}] {desc}" for num, (desc, _) in actions.items())
-    valid_choices = set(actions.keys())
-
     while True:
         print('Добро пожаловать в игру "Виселица"!\nХотите начать новую игру?\n')
-        print(menu_text)
+        print(MENU_TEXT)
         choice_str = input("Введите цифру: ")
         try:
             user_choice = int(choice_str)  # переименовали переменную
-            if user_choice in valid_choices:
-                return actions[user_choice][1]  # возвращаем режим
+            if user_choice in MENU_ACTIONS:
+                return MENU_ACTIONS[user_choice][1]  # возвращаем режим
             else:
-                print(f"Пожалуйста, введите один из вариантов: {', '.join(map(str, valid_choices))}")
+                print(f"Пожалуйста, введите один из вариантов: {VALID_CHOICES_TEXT}")
         except ValueError:
-            print(f"Ошибка: введите цифру из предложенных вариантов: {', '.join(map(str, valid_choices))}!")
+            print(f"Ошибка: введите цифру из предложенных вариантов: {VALID_CHOICES_TEXT}!")
 
 
 def start_game(game_mode: str = "normal") -> None:
@@ -98,31 +113,35 @@ def initialize_game(game_mode: str = "normal") -> GameState:
     Инициализирует состояние игры.
 
     :param game_mode: Режим игры, может быть "easy" или "normal". По умолчанию "normal".
-    :return: Словарь с состоянием игры, содержащий загаданное слово, маску слова, счетчик ошибок, список угаданных букв,
-    максимальное количество ошибок и режим игры.
+    :return: Состояние игры, содержащее загаданное слово, флаги открытых букв, счетчик ошибок, отсортированную
+    строку угаданных букв, максимальное количество ошибок, режим игры, множество букв слова, множество открытых букв
+    и количество ещё скрытых позиций.
     """
     word = get_random_word()
-    word = word.upper()
-    mask: list[str] = create_word_mask(word)
-
-    state: GameState = {
-        "word": word,
-        "mask": mask,
-        "error_count": 0,
-        "guessed_letters": [],
-        "max_errors": 6,
-        "game_mode": game_mode,
-    }
+    flags: bytearray = create_word_mask(word)
+
+    letter_set = frozenset(word)
+
+    # Символы вне алфавита (например, дефис) игрок ввести не может, поэтому они открыты с самого начала
+    # и не входят в счетчик скрытых позиций
+    state = GameState(
+        word=word,
+        flags=flags,
+        game_mode=game_mode,
+        letter_set=letter_set,
+        revealed=set(letter_set - RUSSIAN_LETTERS),
+        remaining=flags.count(0),
+    )
 
     if game_mode == "easy":
         letters_to_reveal: list[str] = select_letters_for_easy(word)
         if not letters_to_reveal:
             print("Нет подходящих слов для лёгкого режима. Игра начинается в нормальном режиме.")
-            state["game_mode"] = "normal"
+            state.game_mode = "normal"
         else:
             for letter in letters_to_reveal:
                 reveal_letter(state, letter)
-                state["guessed_letters"].append(letter)
+                state.guessed = "".join(sorted(state.guessed + letter))
 
     return state
 
@@ -136,7 +155,7 @@ def play_round(state: GameState) -> None:
     """
     print_separator()
     print("Игра началась! Укажите букву, которая, по-вашему, есть в загаданном слове")
-    while state["error_count"] < state["max_errors"] and "_" in state["mask"]:
+    while state.error_count < state.max_errors and state.remaining > 0:
         process_player_turn(state)
     check_game_end(state)
 
@@ -148,7 +167,7 @@ def process_player_turn(state: GameState) -> None:
     :param state: Текущее состояние игры.
     """
     display_game_state(state)
-    player_letter: str = input("Ваша буква (только одна, кириллица): ").upper()
+    player_letter: str = input("Ваша буква (только одна, кириллица): ").translate(RUSSIAN_UPPERCASE_TABLE)
     print_separator()
 
     if not is_valid_russian_letter(player_letter):
@@ -158,7 +177,7 @@ def process_player_turn(state: GameState) -> None:
         )
         return
 
-    if player_letter in state["guessed_letters"]:
+    if player_letter in state.guessed:
         print("Вы уже вводили эту букву, введите другую!")
         return
 
@@ -171,12 +190,13 @@ def display_game_state(state: GameState) -> None:
 
     :param state: Текущее состояние игры.
     """
-    print_separator()
-    print(
-        f"{draw_hangman(state['error_count'])}\n"
-        f"Загаданное слово: {' '.join(state['mask'])}\n"
-        f"Осталось попыток: {state['max_errors'] - state['error_count']}\n"
-        f"Использованные буквы: {', '.join(sorted(state['guessed_letters']))}\n"
+    masked_word = " ".join(char if revealed else "_" for char, revealed in zip(state.word, state.flags))
+    sys.stdout.write(
+        f"{get_separator()}\n"
+        f"{draw_hangman(state.error_count)}\n"
+        f"Загаданное слово: {masked_word}\n"
+        f"Осталось попыток: {state.max_errors - state.error_count}\n"
+        f"Использованные буквы: {', '.join(state.guessed)}\n\n"
     )
 
 
@@ -184,17 +204,42 @@ def select_letters_for_easy(word: str) -> list[str]:
     """
     Выбирает буквы для раскрытия в легком режиме.
 
+    Из букв, встречающихся в слове один раз, выбираются самые частотные в русском языке. Если таких букв не хватает,
+    раскрывается одна самая частотная буква, встречающаяся в слове ровно EASY_MODE_LETTERS раз. Символы вне алфавита
+    не учитываются: они открыты в любом режиме.
+
     :param word: Загаданное слово.
     :return: Список букв, которые будут раскрыты.
     """
-    letter_counts: dict[str, int] = Counter(word)
-    single_occurrence_letters: list[str] = [char for char, count in letter_counts.items() if count == 1]
+    single_occurrence_letters: list[str] = []
+    double_occurrence_letters: list[str] = []
+    for char, count in Counter(word).items():
+        if char not in RUSSIAN_LETTERS:
+            continue
+        if count == 1:
+            single_occurrence_letters.append(char)
+        elif count == EASY_MODE_LETTERS:
+            double_occurrence_letters.append(char)
 
     if len(single_occurrence_letters) >= EASY_MODE_LETTERS:
-        return sample(single_occurrence_letters, EASY_MODE_LETTERS)
+        single_occurrence_letters.sort(key=get_frequency_rank)
+        return single_occurrence_letters[:EASY_MODE_LETTERS]
+
+    if double_occurrence_letters:
+        return [min(double_occurrence_letters, key=get_frequency_rank)]
     return []
 
 
+def get_frequency_rank(char: str) -> int:
+    """
+    Возвращает ранг частотности буквы в русском языке.
+
+    :param char: Буква слова.
+    :return: Ранг буквы (0 — самая частая); символы вне алфавита получают ранг -1, то есть идут первыми.
+    """
+    return RUSSIAN_LETTER_FREQUENCY_RANK.get(char, -1)
+
+
 def is_valid_russian_letter(char: str) -> bool:
     """
     Проверяет, является ли введенный символ одной буквой русского алфавита.
@@ -202,7 +247,7 @@ def is_valid_russian_letter(char: str) -> bool:
     :param char: Введенный символ.
     :return: True, если символ является одной буквой русского алфавита, иначе False.
     """
-    return len(char) == 1 and char.isalpha() and ("А" <= char <= "Я" or char == "Ё")
+    return len(char) == 1 and char in RUSSIAN_LETTERS
 
 
 def check_game_end(state: GameState) -> None:
@@ -211,14 +256,14 @@ def check_game_end(state: GameState) -> None:
 
     :param state: Текущее состояние игры.
     """
-    if state["error_count"] >= state["max_errors"]:
-        print(
-            f"Вы потратили все попытки и проиграли!\nБыло загадано слово: {state['word']}\n"
-            f"{draw_hangman(state['error_count'])}"
+    if state.error_count >= state.max_errors:
+        result = (
+            f"Вы потратили все попытки и проиграли!\nБыло загадано слово: {state.word}\n"
+            f"{draw_hangman(state.error_count)}"
         )
     else:
-        print(f"Поздравляем, вы верно отгадали слово {state['word']}\n{win_pics}")
-    print_separator()
+        result = f"Поздравляем, вы верно отгадали слово {state.word}\n{win_pics}"
+    sys.stdout.write(f"{result}\n{get_separator()}\n")
 
 
 def update_word_mask(state: GameState, letter: str) -> None:
@@ -228,57 +273,100 @@ def update_word_mask(state: GameState, letter: str) -> None:
     :param state: Текущее состояние игры.
     :param letter: Угаданная буква.
     """
-    state["guessed_letters"].append(letter)
-    if letter in state["word"]:
+    state.guessed = "".join(sorted(state.guessed + letter))
+    if letter in state.letter_set:
         print(f"Верно, буква {letter} есть в загаданном слове!")
         reveal_letter(state, letter)
     else:
         print(f"К сожалению, буква {letter} отсутствует в загаданном слове.")
-        state["error_count"] += 1
+        state.error_count += 1
 
 
 def reveal_letter(state: GameState, letter: str) -> None:
     """
-    Раскрывает букву в маске слова, если она есть в загаданном слове.
+    Раскрывает букву в маске слова, если она есть в загаданном слове, и уменьшает счетчик скрытых позиций.
+    Каждая буква должна раскрываться не больше одного раза.
 
     :param state: Текущее состояние игры.
     :param letter: Буква, которую нужно раскрыть.
     """
-    for i in range(len(state["word"])):
-        if state["word"][i] == letter:
-            state["mask"][i] = letter
+    revealed = state.revealed
+    revealed.add(letter)
+    state.flags = bytearray([char in revealed for char in state.word])
+    state.remaining -= state.word.count(letter)
 
 
 def load_words() -> None:
     """
     Загружает список слов из файла в глобальную переменную WORDS.
+
+    Файл читается один раз при запуске, все последующие игры выбирают слово из уже загруженного кортежа.
+    Слова сразу приводятся к верхнему регистру. Пустые строки пропускаются, а слова интернируются, так что повторы
+    в файле хранятся одним объектом.
+
+    Если файл больше STREAM_THRESHOLD_BYTES или задана переменная окружения HANGMAN_STREAM=1, слова в память
+    не загружаются, а включается потоковый выбор слова (см. stream_random_word). Файл при этом один раз
+    просматривается построчно, чтобы пустой файл отклонялся так же, как и при загрузке в память.
     """
-    global WORDS
-    with open("words.txt", encoding="utf-8") as file:
-        WORDS = file.read().splitlines()
-        if not WORDS:
-            raise ValueError("Файл слов пустой.")
+    global WORDS, STREAM_WORDS
+    if os.environ.get("HANGMAN_STREAM") == "1" or os.path.getsize(WORDS_FILE) > STREAM_THRESHOLD_BYTES:
+        with open(WORDS_FILE, encoding="utf-8") as file:
+            if not any(line.rstrip("\r\n") for line in file):
+                raise ValueError("Файл слов пустой.")
+        STREAM_WORDS = True
+        return
+
+    with open(WORDS_FILE, encoding="utf-8") as file:
+        WORDS = tuple(sys.intern(line.upper()) for line in file.read().splitlines() if line)
+    if not WORDS:
+        raise ValueError("Файл слов пустой.")
 
 
 def get_random_word() -> str:
     """
-    Выбирает случайное слово из файла для игры.
+    Выбирает случайное слово из загруженного списка слов для игры.
 
-    :return: Случайное слово.
+    :return: Случайное слово в верхнем регистре.
     """
+    if STREAM_WORDS:
+        return stream_random_word()
     if not WORDS:
         raise RuntimeError("Список слов пуст.")
     return choice(WORDS)
 
 
-def create_word_mask(word: str) -> list[str]:
+def stream_random_word() -> str:
+    """
+    Выбирает случайное слово за один проход по файлу, не загружая его в память (reservoir sampling, алгоритм R).
+
+    Каждое непустое слово файла выбирается с равной вероятностью.
+
+    :return: Случайное слово в верхнем регистре.
+    """
+    chosen = ""
+    count = 0
+    with open(WORDS_FILE, encoding="utf-8") as file:
+        for line in file:
+            word = line.rstrip("\r\n")
+            if not word:
+                continue
+            count += 1
+            if randrange(count) == 0:
+                chosen = word
+    if not chosen:
+        raise RuntimeError("Список слов пуст.")
+    return chosen.upper()
+
+
+def create_word_mask(word: str) -> bytearray:
     """
-    Создает маску для загаданного слова, состоящую из подчеркиваний.
+    Создает маску для загаданного слова: по одному байту-флагу на каждую позицию (0 — буква скрыта, 1 — открыта).
+    Символы вне алфавита открыты сразу, так как игрок не может их ввести.
 
     :param word: Загаданное слово.
-    :return: Список подчеркиваний, соответствующий длине слова.
+    :return: Массив флагов, соответствующий длине слова.
     """
-    return ["_" for _ in word]
+    return bytearray([char not in RUSSIAN_LETTERS for char in word])
 
 
 if __name__ == "__main__":